@@ -1,14 +1,20 @@
+import os
+
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_limiter import FastAPILimiter
 
-import redis.asyncio as redis
+import cloudinary
 
 from src.routes import contacts, users
+from src.database.db import get_redis
+from src.services.email import email_worker, smtp_pool
+from src.conf.config import settings
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.include_router(users.router, prefix='/api')
 app.include_router(contacts.router, prefix='/api')
@@ -16,6 +22,10 @@ app.include_router(contacts.router, prefix='/api')
 
 origins = ["http://localhost:3000"]
 
+# Middleware must be pure ASGI (class X: __init__(self, app) / async __call__(self, scope, receive, send)).
+# BaseHTTPMiddleware and @app.middleware("http") allocate a task group and memory streams per request;
+# tests/test_main.py fails if one is registered.
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -27,13 +37,34 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup():
-    redis_client = redis.from_url("redis://localhost", encoding="utf-8", decode_responses=True)
-    await FastAPILimiter.init(redis_client)
+    app.state.redis = get_redis()
+    await FastAPILimiter.init(app.state.redis)
+    cloudinary.config(
+        cloud_name=settings.cloudinary_name,
+        api_key=settings.cloudinary_api_key,
+        api_secret=settings.cloudinary_api_secret,
+        secure=True
+    )
+    email_worker.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await FastAPILimiter.close()
+    await email_worker.stop()
+    await smtp_pool.close()
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to FastAPI!"}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count())),
+    )
@@ -0,0 +1,35 @@
+"""'Contacts owner indexes'
+
+Revision ID: 5d2e91c08b4f
+Revises: a3ca895d7175
+Create Date: 2026-10-14 10:03:27.861342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e91c08b4f'
+down_revision: Union[str, None] = 'a3ca895d7175'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_owner_birth', 'contacts', ['owner_id', 'birth_date'], unique=False)
+    op.execute(
+        'CREATE INDEX ix_contacts_owner_mmdd ON contacts '
+        '(owner_id, (extract(month from birth_date)), (extract(day from birth_date)))'
+    )
+    op.drop_index('ix_contacts_first_name', table_name='contacts')
+    op.drop_index('ix_contacts_last_name', table_name='contacts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_contacts_last_name', 'contacts', ['last_name'], unique=False)
+    op.create_index('ix_contacts_first_name', 'contacts', ['first_name'], unique=False)
+    op.drop_index('ix_contacts_owner_mmdd', table_name='contacts')
+    op.drop_index('ix_contacts_owner_birth', table_name='contacts')
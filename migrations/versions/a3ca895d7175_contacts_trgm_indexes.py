@@ -0,0 +1,31 @@
+"""'Contacts trgm indexes'
+
+Revision ID: a3ca895d7175
+Revises: 73419a43fb78
+Create Date: 2026-10-14 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3ca895d7175'
+down_revision: Union[str, None] = '73419a43fb78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('contacts_first_name_trgm', 'contacts', ['first_name'], unique=False, postgresql_using='gin', postgresql_ops={'first_name': 'gin_trgm_ops'})
+    op.create_index('contacts_last_name_trgm', 'contacts', ['last_name'], unique=False, postgresql_using='gin', postgresql_ops={'last_name': 'gin_trgm_ops'})
+    op.create_index('contacts_email_trgm', 'contacts', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('contacts_email_trgm', table_name='contacts', postgresql_using='gin')
+    op.drop_index('contacts_last_name_trgm', table_name='contacts', postgresql_using='gin')
+    op.drop_index('contacts_first_name_trgm', table_name='contacts', postgresql_using='gin')
@@ -0,0 +1,43 @@
+"""'Contacts owner email unique'
+
+Revision ID: c71f0a9e3d26
+Revises: 5d2e91c08b4f
+Create Date: 2026-10-14 10:48:09.532170
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71f0a9e3d26'
+down_revision: Union[str, None] = '5d2e91c08b4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Contacts could share an email before; refuse to migrate until the duplicates are resolved.
+    # Offline (--sql) runs cannot query the data, so the index creation itself reports them there.
+    if not context.is_offline_mode():
+        check_duplicate_contacts()
+    op.execute('CREATE UNIQUE INDEX contacts_owner_email_uniq ON contacts (owner_id, lower(email))')
+
+
+def check_duplicate_contacts() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        'SELECT owner_id, lower(email) AS email, array_agg(id ORDER BY id) AS ids FROM contacts '
+        'GROUP BY owner_id, lower(email) HAVING count(*) > 1 ORDER BY owner_id, lower(email)'
+    )).fetchall()
+    if duplicates:
+        groups = '\n'.join(f'  owner_id={owner_id} email={email} contact ids={ids}' for owner_id, email, ids in duplicates)
+        raise RuntimeError(
+            'Cannot create contacts_owner_email_uniq: these users have several contacts with the same email. '
+            'Merge or change them, then run the migration again.\n' + groups
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('contacts_owner_email_uniq', table_name='contacts')
@@ -0,0 +1,26 @@
+"""'Contacts owner id keyset index'
+
+Revision ID: e4b8d2f61a90
+Revises: c71f0a9e3d26
+Create Date: 2026-10-14 13:26:51.618904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8d2f61a90'
+down_revision: Union[str, None] = 'c71f0a9e3d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_owner_id_id', 'contacts', ['owner_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_owner_id_id', table_name='contacts')
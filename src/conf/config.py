@@ -7,6 +7,11 @@ class Settings(BaseSettings):
     postgres_password: str
     postgres_port: str
     sqlalchemy_database_url: str
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_use_pgbouncer: bool = False
     secret_key: str
     algorithm: str
     mail_username: str
@@ -1,19 +1,82 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from functools import lru_cache
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+from sqlalchemy.pool import NullPool
+
+import redis.asyncio as redis
 
 from src.conf.config import settings
 
 
 SQLALCHEMY_DATABASE_URL = settings.sqlalchemy_database_url
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """
+    Create the application-wide async engine.
+
+    The engine is built only once, so every session shares a single connection pool. When the
+    database is fronted by PgBouncer in transaction-pooling mode, pooling is left to PgBouncer
+    and the application opens connections through a NullPool instead. Because PgBouncer may hand
+    the server connection to another client between transactions, asyncpg's prepared statement
+    caches are disabled and every statement is prepared under a unique name.
+
+    :return: The async database engine.
+    :rtype: AsyncEngine
+    """
+    if settings.db_use_pgbouncer:
+        return create_async_engine(
+            SQLALCHEMY_DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        )
+    return create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+engine = get_engine()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+SessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """
+    Create the application-wide async Redis client.
+
+    The client is built only once, so the rate limiter and the user cache share its connection pool.
+    The pool is a blocking one: when all its connections are in use, callers wait up to
+    ``timeout`` seconds for one to be released instead of failing with "Too many connections".
+
+    :return: The async Redis client.
+    :rtype: redis.Redis
+    """
+    pool = redis.BlockingConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=0,
+        encoding="utf-8",
+        decode_responses=True,
+        max_connections=50,
+        timeout=5,
+        health_check_interval=30,
+    )
+    return redis.Redis.from_pool(pool)
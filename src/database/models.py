@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Boolean, func
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Boolean, Index, extract, func
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql.sqltypes import DateTime
 
@@ -18,19 +18,28 @@ class User(Base):
     refresh_token = Column(String, nullable=True)
     confirmed = Column(Boolean, default=False)
 
-    contacts = relationship("Contact", back_populates="owner")
+    contacts = relationship("Contact", back_populates="owner", lazy="raise")
 
 
 class Contact(Base):
     __tablename__ = "contacts"
 
     id = Column(Integer, primary_key=True, index=True)
-    first_name = Column(String, index=True)
-    last_name = Column(String, index=True)
+    first_name = Column(String)
+    last_name = Column(String)
     email = Column(String, index=True)
     phone_number = Column(String)
     birth_date = Column(Date)
     additional_info = Column(String)
 
     owner_id = Column(Integer, ForeignKey("users.id"))
-    owner = relationship("User", back_populates="contacts")
+    owner = relationship("User", back_populates="contacts", lazy="raise")
+
+
+Index("contacts_first_name_trgm", Contact.first_name, postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"})
+Index("contacts_last_name_trgm", Contact.last_name, postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"})
+Index("contacts_email_trgm", Contact.email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"})
+Index("ix_contacts_owner_id_id", Contact.owner_id, Contact.id)
+Index("ix_contacts_owner_birth", Contact.owner_id, Contact.birth_date)
+Index("ix_contacts_owner_mmdd", Contact.owner_id, extract("month", Contact.birth_date), extract("day", Contact.birth_date))
+Index("contacts_owner_email_uniq", Contact.owner_id, func.lower(Contact.email), unique=True)
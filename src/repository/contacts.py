@@ -1,33 +1,58 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from datetime import datetime, timedelta
+import calendar
+from datetime import date, datetime, timedelta
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, extract
+from sqlalchemy import select, and_, tuple_, extract, func, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Contact, User
 from src.schemas import ContactUpdate, ContactCreate
 
 
-async def get_contacts(skip: int, limit: int, user: User, db: Session) -> List[Contact]:
+# Only the response columns are selected, so rows are returned without building ORM instances.
+CONTACT_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone_number,
+    Contact.birth_date,
+    Contact.additional_info,
+    Contact.owner_id,
+)
+
+
+async def get_contacts(after_id: Optional[int], limit: int, user: User, db: AsyncSession) -> Sequence[Row]:
     """
-    Retrieve a list of contacts for a user, with pagination.
+    Retrieve a page of contacts for a user, using keyset pagination on the contact ID.
 
-    :param skip: The number of contacts to skip for pagination.
-    :type skip: int
-    :param limit: The maximum number of contacts to return.
+    Contacts are ordered by ID and the page starts right after ``after_id``, so the database seeks
+    directly to the page instead of scanning and discarding skipped rows. One contact more than
+    ``limit`` is fetched, so the caller can tell whether another page follows.
+
+    :param after_id: The ID of the last contact on the previous page, or None for the first page.
+    :type after_id: Optional[int]
+    :param limit: The number of contacts on a page.
     :type limit: int
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
-    :return: A list of contacts.
-    :rtype: List[Contact]
+    :type db: AsyncSession
+    :return: A list of up to ``limit + 1`` contact rows.
+    :rtype: Sequence[Row]
     """
-    return db.query(Contact).filter(Contact.owner_id == user.id).offset(skip).limit(limit).all()
+    stmt = select(*CONTACT_COLUMNS).where(Contact.owner_id == user.id)
+    if after_id is not None:
+        stmt = stmt.where(Contact.id > after_id)
+    stmt = stmt.order_by(Contact.id).limit(limit + 1)
+    contacts = await db.execute(stmt)
+    return contacts.all()
 
 
-async def get_contact(contact_id: int, user: User, db: Session) -> Contact:
+async def get_contact(contact_id: int, user: User, db: AsyncSession) -> Contact:
     """
     Retrieve a single contact by its ID.
 
@@ -36,42 +61,76 @@ async def get_contact(contact_id: int, user: User, db: Session) -> Contact:
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: The contact with the specified ID, or None if not found.
     :rtype: Contact
     """
-    return db.query(Contact).filter(Contact.id == contact_id, Contact.owner_id == user.id).first()
+    stmt = select(Contact).where(Contact.id == contact_id, Contact.owner_id == user.id)
+    contact = await db.execute(stmt)
+    return contact.scalars().first()
 
 
-async def create_contact(body: ContactCreate, user: User, db: Session) -> Contact:
+def insert_contacts():
+    """
+    Build an ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` statement for contacts.
+
+    Conflicts are checked against the unique ``(owner_id, lower(email))`` index, so duplicates are
+    skipped by the database instead of being looked up beforehand.
+
+    :return: The insert statement, to be executed with one or more rows of values.
+    :rtype: Insert
+    """
+    return insert(Contact).on_conflict_do_nothing(
+        index_elements=[Contact.owner_id, func.lower(Contact.email)]
+    ).returning(*CONTACT_COLUMNS)
+
+
+async def create_contact(body: ContactCreate, user: User, db: AsyncSession) -> Row | None:
     """
     Create a new contact for a user.
 
+    The insert and the duplicate check run as a single statement, see ``insert_contacts``.
+
     :param body: The contact details.
     :type body: ContactCreate
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
-    :return: The created contact.
-    :rtype: Contact
+    :type db: AsyncSession
+    :return: The created contact row, or None if the user already has a contact with the same email.
+    :rtype: Row | None
     """
-    contact = Contact(
-        first_name=body.first_name,
-        last_name=body.last_name,
-        email=body.email,
-        phone_number=body.phone_number,
-        birth_date=body.birth_date,
-        additional_info=body.additional_info,
-        owner_id=user.id,
-    )
-    db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    result = await db.execute(insert_contacts().values(**body.model_dump(), owner_id=user.id))
+    contact = result.first()
+    await db.commit()
     return contact
 
 
-async def update_contact(contact_id: int, body: ContactUpdate, user: User, db: Session) -> Contact | None:
+async def bulk_create_contacts(bodies: List[ContactCreate], user: User, db: AsyncSession) -> Sequence[Row]:
+    """
+    Create several contacts for a user in one statement.
+
+    Contacts whose email the user already has, or which repeat an email earlier in ``bodies``, are
+    skipped.
+
+    :param bodies: The details of the contacts to create.
+    :type bodies: List[ContactCreate]
+    :param user: The current authenticated user.
+    :type user: User
+    :param db: The database session dependency.
+    :type db: AsyncSession
+    :return: The rows of the contacts that were created.
+    :rtype: Sequence[Row]
+    """
+    if not bodies:
+        return []
+    result = await db.execute(insert_contacts().values([{**body.model_dump(), "owner_id": user.id} for body in bodies]))
+    contacts = result.all()
+    await db.commit()
+    return contacts
+
+
+async def update_contact(contact_id: int, body: ContactUpdate, user: User, db: AsyncSession) -> Contact | None:
     """
     Update an existing contact.
 
@@ -82,11 +141,14 @@ async def update_contact(contact_id: int, body: ContactUpdate, user: User, db: S
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: The updated contact, or None if not found.
     :rtype: Contact | None
+    :raises IntegrityError: If the user already has another contact with the new email.
     """
-    db_contact = db.query(Contact).filter(Contact.id == contact_id, Contact.owner_id == user.id).first()
+    stmt = select(Contact).where(Contact.id == contact_id, Contact.owner_id == user.id)
+    result = await db.execute(stmt)
+    db_contact = result.scalars().first()
     if db_contact:
         db_contact.first_name = body.first_name
         db_contact.last_name = body.last_name
@@ -94,12 +156,16 @@ async def update_contact(contact_id: int, body: ContactUpdate, user: User, db: S
         db_contact.phone_number = body.phone_number
         db_contact.birth_date = body.birth_date
         db_contact.additional_info = body.additional_info
-        db.commit()
-        db.refresh(db_contact)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise
+        await db.refresh(db_contact)
     return db_contact
 
 
-async def remove_contact(contact_id: int, user: User, db: Session) -> Contact | None:
+async def remove_contact(contact_id: int, user: User, db: AsyncSession) -> Contact | None:
     """
     Remove a contact by its ID.
 
@@ -108,18 +174,20 @@ async def remove_contact(contact_id: int, user: User, db: Session) -> Contact |
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: The removed contact, or None if not found.
     :rtype: Contact | None
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id, Contact.owner_id == user.id).first()
+    stmt = select(Contact).where(Contact.id == contact_id, Contact.owner_id == user.id)
+    result = await db.execute(stmt)
+    contact = result.scalars().first()
     if contact:
-        db.delete(contact)
-        db.commit()
+        await db.delete(contact)
+        await db.commit()
     return contact
 
 
-async def search_contact(first_name: Optional[str], last_name: Optional[str], email: Optional[str], user: User, db: Session) -> List[Contact]:
+async def search_contact(first_name: Optional[str], last_name: Optional[str], email: Optional[str], user: User, db: AsyncSession) -> Sequence[Row]:
     """
     Search for contacts based on the provided criteria.
 
@@ -132,50 +200,57 @@ async def search_contact(first_name: Optional[str], last_name: Optional[str], em
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
-    :return: A list of contacts matching the search criteria.
-    :rtype: List[Contact]
+    :type db: AsyncSession
+    :return: A list of contact rows matching the search criteria.
+    :rtype: Sequence[Row]
     """
-    query = db.query(Contact).filter(Contact.owner_id == user.id)
+    conditions = [Contact.owner_id == user.id]
     if first_name:
-        query = query.filter(Contact.first_name.ilike(f"%{first_name}%"))
+        conditions.append(Contact.first_name.ilike(f"%{first_name}%"))
     if last_name:
-        query = query.filter(Contact.last_name.ilike(f"%{last_name}%"))
+        conditions.append(Contact.last_name.ilike(f"%{last_name}%"))
     if email:
-        query = query.filter(Contact.email.ilike(f"%{email}%"))
-    return query.all()
+        conditions.append(Contact.email.ilike(f"%{email}%"))
+    contacts = await db.execute(select(*CONTACT_COLUMNS).where(and_(*conditions)))
+    return contacts.all()
 
 
-async def get_upcoming_birthdays(user: User, db: Session) -> List[Contact]:
+def upcoming_birthday_days(today: date, days: int = 7) -> List[tuple[int, int]]:
+    """
+    Compute the (month, day) pairs of the birthdays falling within the next ``days`` days.
+
+    In a year without Feb 29, birthdays on Feb 29 are celebrated with the window that contains
+    Feb 28 or Mar 1.
+
+    :param today: The first day of the window.
+    :type today: date
+    :param days: The number of days in the window.
+    :type days: int
+    :return: The (month, day) pairs of the window.
+    :rtype: List[tuple[int, int]]
+    """
+    window = [today + timedelta(days=i) for i in range(days)]
+    upcoming_days = [(day.month, day.day) for day in window]
+    if any((day.month, day.day) in ((2, 28), (3, 1)) and not calendar.isleap(day.year) for day in window):
+        upcoming_days.append((2, 29))
+    return upcoming_days
+
+
+async def get_upcoming_birthdays(user: User, db: AsyncSession) -> List[Contact]:
     """
     Retrieve a list of contacts with upcoming birthdays within the next 7 days.
 
     :param user: The current authenticated user.
     :type user: User
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: A list of contacts with birthdays within the next 7 days.
     :rtype: List[Contact]
     """
-    today = datetime.now().date()
-    seven_days_later = today + timedelta(days=7)
-    upcoming_birthdays = db.query(Contact).filter(
+    upcoming_days = upcoming_birthday_days(datetime.now().date())
+    stmt = select(Contact).where(
         Contact.owner_id == user.id,
-        or_(
-            and_(
-                extract('month', Contact.birth_date) == today.month,
-                extract('day', Contact.birth_date) >= today.day,
-                extract('day', Contact.birth_date) < (today.day + 7)
-            ),
-            and_(
-                extract('month', Contact.birth_date) == (today.replace(month=today.month % 12 + 1)).month,
-                extract('day', Contact.birth_date) <= seven_days_later.day
-            )
-        )
-    ).all()
-    filtered_birthdays = [
-        contact for contact in upcoming_birthdays
-        if (datetime(today.year, contact.birth_date.month, contact.birth_date.day).date() - today).days in range(7)
-        or (datetime(today.year + 1, contact.birth_date.month, contact.birth_date.day).date() - today).days in range(7)
-    ]    
-    return filtered_birthdays
\ No newline at end of file
+        tuple_(extract('month', Contact.birth_date), extract('day', Contact.birth_date)).in_(upcoming_days)
+    )
+    contacts = await db.execute(stmt)
+    return contacts.scalars().all()
@@ -1,55 +1,101 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.schemas import UserModel
 
-from libgravatar import Gravatar
+import hashlib
+from functools import lru_cache
 
 
-async def get_user_by_email(email: str, db: Session) -> User:
+AUTH_USER_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.created_at,
+    User.avatar,
+    User.confirmed,
+)
+
+
+@lru_cache(maxsize=1024)
+def gravatar_url(email: str) -> str:
+    """
+    Build the Gravatar identicon URL for an email address.
+
+    :param email: The email address.
+    :type email: str
+    :return: The Gravatar URL derived from the MD5 hash of the normalised address.
+    :rtype: str
+    """
+    email_hash = hashlib.md5(email.strip().lower().encode()).hexdigest()
+    return f"https://www.gravatar.com/avatar/{email_hash}?d=identicon"
+
+
+async def get_user_by_email(email: str, db: AsyncSession) -> User:
     """
     Retrieve a user by their email address.
 
     :param email: The email address of the user to retrieve.
     :type email: str
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: The user with the specified email, or None if no user is found.
     :rtype: User
     """
-    return db.query(User).filter(User.email == email).first()
+    stmt = select(User).where(User.email == email)
+    user = await db.execute(stmt)
+    return user.scalars().first()
 
 
-async def create_user(body: UserModel, db: Session) -> User:
+async def get_auth_user_by_email(email: str, db: AsyncSession) -> User | None:
+    """
+    Retrieve the fields of a user needed by authenticated endpoints.
+
+    Only those columns are selected, without the password hash or the refresh token, and the user
+    is built detached from the session. Use ``get_user_by_email`` when the user is to be modified.
+
+    :param email: The email address of the user to retrieve.
+    :type email: str
+    :param db: The database session dependency.
+    :type db: AsyncSession
+    :return: A detached user with the specified email, or None if no user is found.
+    :rtype: User | None
+    """
+    stmt = select(*AUTH_USER_COLUMNS).where(User.email == email)
+    user = await db.execute(stmt)
+    row = user.mappings().first()
+    return User(**row) if row else None
+
+
+async def create_user(body: UserModel, db: AsyncSession) -> User:
     """
     Create a new user.
 
-    This function creates a new user and assigns an avatar using the Gravatar service if possible.
+    This function creates a new user and assigns a Gravatar avatar. Duplicate emails are rejected by
+    the unique constraint on users.email rather than a separate lookup. The Gravatar URL is derived from
+    the MD5 hash of the email address, so no request to Gravatar is made at signup time.
 
     :param body: The user details.
     :type body: UserModel
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created user, or None if a user with the same email already exists.
     :rtype: User
     """
-    existing_user = db.query(User).filter(User.email == body.email).first()
-    if existing_user:
-        return None
-    avatar = None
-    try:
-        g = Gravatar(body.email)
-        avatar = g.get_image()
-    except Exception as e:
-        print(e)
-    new_user = User(**body.model_dump(), avatar=avatar) #dict()
+    new_user = User(**body.model_dump(), avatar=gravatar_url(body.email)) #dict()
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return None
+    await db.refresh(new_user)
     return new_user
 
 
-async def update_token(user: User, token: str | None, db: Session) -> None:
+async def update_token(user: User, token: str | None, db: AsyncSession) -> None:
     """
     Update the refresh token for a user.
 
@@ -58,13 +104,13 @@ async def update_token(user: User, token: str | None, db: Session) -> None:
     :param token: The new token value, or None to remove the token.
     :type token: str | None
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     """
     user.refresh_token = token
-    db.commit()
+    await db.commit()
 
 
-async def confirmed_email(email: str, db: Session) -> None:
+async def confirmed_email(email: str, db: AsyncSession) -> None:
     """
     Confirm the email address of a user.
 
@@ -73,14 +119,14 @@ async def confirmed_email(email: str, db: Session) -> None:
     :param email: The email address of the user to confirm.
     :type email: str
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     """
-    user = await get_user_by_email(email, db)
-    user.confirmed = True
-    db.commit()
+    stmt = update(User).where(User.email == email).values(confirmed=True)
+    await db.execute(stmt)
+    await db.commit()
 
 
-async def update_avatar(email, url: str, db: Session) -> User:
+async def update_avatar(email, url: str, db: AsyncSession) -> User:
     """
     Update the avatar URL for a user.
 
@@ -89,11 +135,12 @@ async def update_avatar(email, url: str, db: Session) -> User:
     :param url: The new avatar URL.
     :type url: str
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: The updated user.
     :rtype: User
     """
-    user = await get_user_by_email(email, db)
-    user.avatar = url
-    db.commit()
+    stmt = update(User).where(User.email == email).values(avatar=url).returning(User)
+    result = await db.execute(stmt)
+    user = result.scalars().first()
+    await db.commit()
     return user
\ No newline at end of file
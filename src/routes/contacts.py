@@ -1,71 +1,100 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
 
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
-from src.schemas import ContactResponse, ContactCreate, ContactUpdate
+from src.schemas import ContactResponse, ContactCreate, ContactUpdate, ContactPage
 from src.repository import contacts
 from src.services.auth import auth_service
-from src.database.models import User, Contact
+from src.services.cache import redis_cache, invalidate_user_cache
+from src.database.models import User
 
 from fastapi_limiter.depends import RateLimiter
 
 
 router = APIRouter(prefix='/contacts', tags=["contacts"])
+contact_list_adapter = TypeAdapter(List[ContactResponse])
+read_contacts_limiter = RateLimiter(times=10, seconds=60)
+
+
+def contact_list_response(rows) -> Response:
+    """
+    Validate and serialize a list of contacts in a single pydantic-core pass.
+
+    List endpoints return this response directly (with ``response_model=None``), so FastAPI does not 
+    re-validate and re-encode every contact one by one.
+
+    :param rows: The contacts or contact rows to return.
+    :type rows: Sequence
+    :return: A JSON response with the serialized contacts.
+    :rtype: Response
+    """
+    contacts = contact_list_adapter.validate_python(rows, from_attributes=True)
+    return Response(content=contact_list_adapter.dump_json(contacts), media_type="application/json")
 
 
 @router.post("/create", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
-async def create_contact(contact: ContactCreate, db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+async def create_contact(contact: ContactCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Create a new contact for the current user.
 
-    This endpoint allows the user to create a new contact. It checks if a contact with the same email 
-    already exists for the user and raises an error if it does.
+    This endpoint allows the user to create a new contact. If a contact with the same email 
+    already exists for the user, an error is raised.
 
     :param contact: The contact details to be created.
     :type contact: ContactCreate
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
     :return: The created contact's details.
     :rtype: ContactResponse
     """
-    existing_contact = db.query(Contact).filter(Contact.email == contact.email, Contact.owner_id == current_user.id).first()
-    if existing_contact:
+    new_contact = await contacts.create_contact(contact, current_user, db)
+    if new_contact is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Contact with this email already exists."
         )
-    return await contacts.create_contact(contact, current_user, db)
+    await invalidate_user_cache(current_user.id)
+    return new_contact
 
 
-@router.get("/read_contacts", response_model=List[ContactResponse], description="No more than 10 requests per minute", dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def read_contacts(skip: int = 0, limit: int = 10, db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+@router.get("/read_contacts", response_model=None, responses={200: {"model": ContactPage}}, description="No more than 10 requests per minute", dependencies=[Depends(read_contacts_limiter)])
+@redis_cache(ttl=30)
+async def read_contacts(after_id: Optional[int] = None, limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Read a list of contacts for the current user.
 
-    This endpoint allows the user to retrieve a list of their contacts. The response is paginated, 
-    allowing the user to specify how many contacts to skip and the limit on the number of contacts returned.
+    This endpoint allows the user to retrieve a list of their contacts. The response is paginated 
+    with a cursor: pass the ``next_cursor`` of one page as ``after_id`` to get the next page.
+    ``next_cursor`` is None on the last page.
 
-    :param skip: The number of contacts to skip.
-    :type skip: int
-    :param limit: The maximum number of contacts to return.
+    :param after_id: The ID of the last contact on the previous page, or None for the first page.
+    :type after_id: Optional[int]
+    :param limit: The maximum number of contacts to return, between 1 and 100.
     :type limit: int
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
-    :return: A list of the user's contacts.
-    :rtype: List[ContactResponse]
+    :return: A page of the user's contacts and the cursor of the next page.
+    :rtype: ContactPage
     """
-    return await contacts.get_contacts(skip, limit, current_user, db)
+    db_contacts = await contacts.get_contacts(after_id, limit, current_user, db)
+    next_cursor = db_contacts[limit - 1].id if len(db_contacts) > limit else None
+    db_contacts = db_contacts[:limit]
+    page = ContactPage.model_validate({"items": db_contacts, "next_cursor": next_cursor}, from_attributes=True)
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @router.get("/read_contact/{contact_id}", response_model=ContactResponse)
-async def read_contact(contact_id: int, db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+async def read_contact(contact_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Read a specific contact by its ID.
 
@@ -74,7 +103,7 @@ async def read_contact(contact_id: int, db: Session = Depends(get_db), current_u
     :param contact_id: The ID of the contact to retrieve.
     :type contact_id: int
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
     :return: The contact's details.
@@ -87,7 +116,7 @@ async def read_contact(contact_id: int, db: Session = Depends(get_db), current_u
 
 
 @router.put("/update_contact/{contact_id}", response_model=ContactResponse)
-async def update_contact(contact_id: int, body: ContactUpdate, db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+async def update_contact(contact_id: int, body: ContactUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Update an existing contact.
 
@@ -98,20 +127,27 @@ async def update_contact(contact_id: int, body: ContactUpdate, db: Session = Dep
     :param body: The updated contact details.
     :type body: ContactUpdate
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
     :return: The updated contact's details.
     :rtype: ContactResponse
     """
-    db_contact = await contacts.update_contact(contact_id, body, current_user, db)
+    try:
+        db_contact = await contacts.update_contact(contact_id, body, current_user, db)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Contact with this email already exists."
+        )
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await invalidate_user_cache(current_user.id)
     return db_contact
 
 
 @router.delete("/delete_contact/{contact_id}", response_model=ContactResponse)
-async def delete_contact(contact_id: int, db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Delete a contact by its ID.
 
@@ -120,7 +156,7 @@ async def delete_contact(contact_id: int, db: Session = Depends(get_db), current
     :param contact_id: The ID of the contact to delete.
     :type contact_id: int
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
     :return: The details of the deleted contact.
@@ -129,11 +165,12 @@ async def delete_contact(contact_id: int, db: Session = Depends(get_db), current
     db_contact = await contacts.remove_contact(contact_id, current_user, db)
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await invalidate_user_cache(current_user.id)
     return db_contact
 
 
-@router.get("/search", response_model=List[ContactResponse])
-async def search_contacts(first_name: Optional[str] = Query(None), last_name: Optional[str] = Query(None), email: Optional[str] = Query(None), db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+@router.get("/search", response_model=None, responses={200: {"model": List[ContactResponse]}})
+async def search_contacts(first_name: Optional[str] = Query(None), last_name: Optional[str] = Query(None), email: Optional[str] = Query(None), db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Search for contacts based on query parameters.
 
@@ -147,7 +184,7 @@ async def search_contacts(first_name: Optional[str] = Query(None), last_name: Op
     :param email: The email of the contact to search for.
     :type email: Optional[str]
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
     :return: A list of contacts matching the search criteria.
@@ -156,18 +193,19 @@ async def search_contacts(first_name: Optional[str] = Query(None), last_name: Op
     db_contacts = await contacts.search_contact(first_name, last_name, email, current_user, db)
     if db_contacts is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return db_contacts
+    return contact_list_response(db_contacts)
 
 
-@router.get("/birthdays", response_model=List[ContactResponse])
-async def get_upcoming_birthdays(db: Session = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
+@router.get("/birthdays", response_model=None, responses={200: {"model": List[ContactResponse]}})
+@redis_cache(ttl=30)
+async def get_upcoming_birthdays(db: AsyncSession = Depends(get_db), current_user: User = Depends(auth_service.get_current_user)):
     """
     Get contacts with upcoming birthdays.
 
     This endpoint allows the user to retrieve a list of contacts who have birthdays coming up.
 
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :param current_user: The current authenticated user.
     :type current_user: User
     :return: A list of contacts with upcoming birthdays.
@@ -176,7 +214,7 @@ async def get_upcoming_birthdays(db: Session = Depends(get_db), current_user: Us
     db_contacts = await contacts.get_upcoming_birthdays(current_user, db)
     if db_contacts is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return db_contacts
+    return contact_list_response(db_contacts)
 
 
 
@@ -1,18 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Security, BackgroundTasks, Request, UploadFile, File
 from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials, HTTPBearer
 
-from sqlalchemy.orm import Session
-
-import cloudinary
-import cloudinary.uploader
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.schemas import UserModel, UserResponse, TokenModel, RequestEmail, UserDb
 from src.repository import users as repository_users
 from src.services.auth import auth_service
-from src.services.email import send_email
+from src.services.email import get_email_queue
+from src.services.avatar import upload_avatar
 from src.database.models import User
-from src.conf.config import settings
 
 
 router = APIRouter(prefix='/auth', tags=["auth"])
@@ -20,7 +17,8 @@ security = HTTPBearer()
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Request, db: Session = Depends(get_db)):
+async def signup(body: UserModel, request: Request, email_queue: list = Depends(get_email_queue),
+                 db: AsyncSession = Depends(get_db)):
     """
     Register a new user.
 
@@ -30,26 +28,28 @@ async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Re
 
     :param body: The user details for signing up.
     :type body: UserModel
-    :param background_tasks: Background tasks for sending the confirmation email.
-    :type background_tasks: BackgroundTasks
     :param request: The HTTP request object.
     :type request: Request
+    :param email_queue: Confirmation emails sent in the background after the response.
+    :type email_queue: list
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: A dictionary with the new user's details and a success message.
     :rtype: dict
     """
     exist_user = await repository_users.get_user_by_email(body.email, db)
     if exist_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account already exists")
-    body.password = auth_service.get_password_hash(body.password)
+    body.password = await auth_service.get_password_hash(body.password)
     new_user = await repository_users.create_user(body, db)
-    background_tasks.add_task(send_email, new_user.email, new_user.username, request.base_url)
+    if new_user is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account already exists")
+    email_queue.append((new_user.email, new_user.username, request.base_url))
     return {"user": new_user, "detail": "User successfully created"}
 
 
 @router.post("/login", response_model=TokenModel)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Authenticate a user and return access and refresh tokens.
 
@@ -60,7 +60,7 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
     :param body: The login form containing username (email) and password.
     :type body: OAuth2PasswordRequestForm
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: A dictionary with the access token, refresh token, and token type.
     :rtype: dict
     """
@@ -69,7 +69,7 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email")
     if not user.confirmed:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not confirmed")
-    if not auth_service.verify_password(body.password, user.password):
+    if not await auth_service.verify_password(body.password, user.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
     
     access_token = await auth_service.create_access_token(data={"sub": user.email})
@@ -79,7 +79,7 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
 
 
 @router.get('/refresh_token', response_model=TokenModel)
-async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_db)):
     """
     Refresh the access token using a refresh token.
 
@@ -89,7 +89,7 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(sec
     :param credentials: The HTTP authorization credentials containing the refresh token.
     :type credentials: HTTPAuthorizationCredentials
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: A dictionary with the new access token, refresh token, and token type.
     :rtype: dict
     """
@@ -107,7 +107,7 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(sec
 
 
 @router.get('/confirmed_email/{token}')
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     Confirm a user's email using a token.
 
@@ -117,7 +117,7 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
     :param token: The token for email confirmation.
     :type token: str
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: A dictionary with a confirmation message.
     :rtype: dict
     """
@@ -128,12 +128,13 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
     if user.confirmed:
         return {"message": "Your email is already confirmed"}
     await repository_users.confirmed_email(email, db)
+    await auth_service.drop_cached_user(email)
     return {"message": "Email confirmed"}
 
 
 @router.post('/request_email')
-async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, request: Request,
-                        db: Session = Depends(get_db)):
+async def request_email(body: RequestEmail, request: Request, email_queue: list = Depends(get_email_queue),
+                        db: AsyncSession = Depends(get_db)):
     """
     Request an email confirmation.
 
@@ -142,12 +143,12 @@ async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, r
 
     :param body: The request body containing the user's email.
     :type body: RequestEmail
-    :param background_tasks: Background tasks for sending the confirmation email.
-    :type background_tasks: BackgroundTasks
     :param request: The HTTP request object.
     :type request: Request
+    :param email_queue: Confirmation emails sent in the background after the response.
+    :type email_queue: list
     :param db: The database session dependency.
-    :type db: Session
+    :type db: AsyncSession
     :return: A dictionary with a message indicating that the confirmation email was sent.
     :rtype: dict
     """
@@ -155,7 +156,7 @@ async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, r
     if user.confirmed:
         return {"message": "Your email is already confirmed"}
     if user:
-        background_tasks.add_task(send_email, user.email, user.username, request.base_url)
+        email_queue.append((user.email, user.username, request.base_url))
     return {"message": "Check your email for confirmation."}
 
 
@@ -174,33 +175,25 @@ async def read_users_me(current_user: User = Depends(auth_service.get_current_us
     return current_user
 
 
-@router.patch('/avatar', response_model=UserDb)
-async def update_avatar_user(file: UploadFile = File(), current_user: User = Depends(auth_service.get_current_user),
-                             db: Session = Depends(get_db)):
+@router.patch('/avatar', response_model=UserDb, status_code=status.HTTP_202_ACCEPTED)
+async def update_avatar_user(background_tasks: BackgroundTasks, file: UploadFile = File(),
+                             current_user: User = Depends(auth_service.get_current_user)):
     """
     Update the current user's avatar.
 
     This endpoint allows the authenticated user to update their avatar by uploading a new image. 
-    The image is uploaded to Cloudinary and the user's avatar URL is updated in the database.
+    The image is uploaded to Cloudinary in the background and the user's avatar URL is updated in 
+    the database once the upload finishes, so the response reports the avatar as pending.
 
+    :param background_tasks: Background tasks for uploading the avatar.
+    :type background_tasks: BackgroundTasks
     :param file: The new avatar file.
     :type file: UploadFile
     :param current_user: The current authenticated user.
     :type current_user: User
-    :param db: The database session dependency.
-    :type db: Session
-    :return: The updated user's details with the new avatar URL.
+    :return: The current user's details with the avatar upload marked as pending.
     :rtype: UserDb
     """
-    cloudinary.config(
-        cloud_name=settings.cloudinary_name,
-        api_key=settings.cloudinary_api_key,
-        api_secret=settings.cloudinary_api_secret,
-        secure=True
-    )
-
-    r = cloudinary.uploader.upload(file.file, public_id=f'NotesApp/{current_user.username}', overwrite=True)
-    src_url = cloudinary.CloudinaryImage(f'NotesApp/{current_user.username}')\
-                        .build_url(width=250, height=250, crop='fill', version=r.get('version'))
-    user = await repository_users.update_avatar(current_user.email, src_url, db)
-    return user
\ No newline at end of file
+    image = await file.read()
+    background_tasks.add_task(upload_avatar, image, current_user.username, current_user.email)
+    return UserDb.model_validate(current_user).model_copy(update={"avatar_status": "pending"})
\ No newline at end of file
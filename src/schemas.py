@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, ConfigDict
 
@@ -21,11 +21,16 @@ class ContactUpdate(ContactModel):
     pass
 
 class ContactResponse(ContactModel):
+    email: str
     id: int
     owner_id: int
 
     model_config = ConfigDict(from_attributes=True)
 
+class ContactPage(BaseModel):
+    items: List[ContactResponse]
+    next_cursor: Optional[int] = None
+
 class UserModel(BaseModel):
     username: str
     email: str
@@ -37,6 +42,7 @@ class UserDb(BaseModel):
     email: str
     created_at: datetime
     avatar: str
+    avatar_status: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
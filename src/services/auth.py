@@ -1,34 +1,58 @@
 from typing import Optional
 
-from jose import JWTError, jwt
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TTLCache
+
+from jose import JWTError, jwk, jwt
 
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 
 from passlib.context import CryptContext
 
+from redis.exceptions import RedisError
+
 from datetime import datetime, timedelta
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repository import users as repository_users
-from src.database.db import get_db
+from src.database.db import get_db, get_redis
+from src.database.models import User
 from src.conf.config import settings
 
-import redis
-
 
 class Auth:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    hash_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
     SECRET_KEY = settings.secret_key
     ALGORITHM = settings.algorithm
+    # Built once instead of python-jose constructing a key object from the secret on every call.
+    SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
-    r = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)
+    r = get_redis()
+    USER_CACHE_TTL = 60
+    # Maps a digest of a verified access token to its (email, exp), so a client repeating the same
+    # token skips the signature check. Users themselves are still read from the Redis user cache,
+    # which is invalidated when their data changes.
+    token_cache = TTLCache(maxsize=8192, ttl=30)
+    # Digests of (hash, password) pairs bcrypt has recently accepted. Failed checks are never
+    # cached, so wrong passwords always pay the full bcrypt cost.
+    verified_passwords = TTLCache(maxsize=4096, ttl=60)
 
-    def verify_password(self, plain_password, hashed_password) -> bool:
+    async def verify_password(self, plain_password, hashed_password) -> bool:
         """
         Compares a plain password with a hashed password to check if they match.
 
+        bcrypt is CPU-bound, so the check runs in a dedicated thread pool instead of the event loop.
+        A successful check is remembered for a minute, so repeated logins skip bcrypt.
+
         :param plain_password: The plain text password.
         :type plain_password: str
         :param hashed_password: The hashed password.
@@ -36,18 +60,28 @@ class Auth:
         :return: True if the passwords match, False otherwise.
         :rtype: bool
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        key = hashlib.sha256(f"{hashed_password}\0{plain_password}".encode()).digest()
+        if key in self.verified_passwords:
+            return True
+        loop = asyncio.get_running_loop()
+        verified = await loop.run_in_executor(self.hash_executor, self.pwd_context.verify, plain_password, hashed_password)
+        if verified:
+            self.verified_passwords[key] = True
+        return verified
 
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """
         Generates a hash for a plain password using the bcrypt algorithm.
 
+        bcrypt is CPU-bound, so the hash is computed in a dedicated thread pool instead of the event loop.
+
         :param password: The plain text password.
         :type password: str
         :return: The hashed password.
         :rtype: str
         """
-        return self.pwd_context.hash(password)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.hash_executor, self.pwd_context.hash, password)
 
     async def create_access_token(self, data: dict, expires_delta: Optional[float] = None):
         """
@@ -66,7 +100,7 @@ class Auth:
         else:
             expire = datetime.utcnow() + timedelta(minutes=15)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "access_token"})
-        encoded_access_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        encoded_access_token = jwt.encode(to_encode, self.SIGNING_KEY, algorithm=self.ALGORITHM)
         return encoded_access_token
 
     async def create_refresh_token(self, data: dict, expires_delta: Optional[float] = None):
@@ -86,7 +120,7 @@ class Auth:
         else:
             expire = datetime.utcnow() + timedelta(days=7)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "refresh_token"})
-        encoded_refresh_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        encoded_refresh_token = jwt.encode(to_encode, self.SIGNING_KEY, algorithm=self.ALGORITHM)
         return encoded_refresh_token
 
     async def decode_refresh_token(self, refresh_token: str) -> str:
@@ -100,7 +134,7 @@ class Auth:
         :raises HTTPException: If the token is invalid or the scope is incorrect.
         """
         try:
-            payload = jwt.decode(refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = jwt.decode(refresh_token, self.SIGNING_KEY, algorithms=[self.ALGORITHM])
             if payload['scope'] == 'refresh_token':
                 email = payload['sub']
                 return email
@@ -108,28 +142,110 @@ class Auth:
         except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate credentials')
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-        try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            if payload['scope'] == 'access_token':
-                email = payload["sub"]
-                if email is None:
-                    raise credentials_exception
-            else:
-                raise credentials_exception
-        except JWTError as e:
+        email = self.decode_access_token(token)
+        if email is None:
             raise credentials_exception
-        
-        user = await repository_users.get_user_by_email(email, db)
+
+        user = await self.get_cached_user(email)
         if user is None:
-            raise credentials_exception
+            user = await repository_users.get_auth_user_by_email(email, db)
+            if user is None:
+                raise credentials_exception
+            await self.cache_user(user)
         return user
+
+    def decode_access_token(self, token: str) -> str | None:
+        """
+        Verifies a JWT access token and returns the associated email.
+
+        Verified tokens are remembered for a short time; a remembered token is only checked
+        against its own expiration time.
+
+        :param token: The access token to verify.
+        :type token: str
+        :return: The email associated with the token, or None if the token is invalid or expired.
+        :rtype: str | None
+        """
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = self.token_cache.get(key)
+        if cached is not None:
+            email, expires = cached
+            if expires > time.time():
+                return email
+            self.token_cache.pop(key, None)
+            return None
+
+        try:
+            payload = jwt.decode(token, self.SIGNING_KEY, algorithms=[self.ALGORITHM])
+        except JWTError:
+            return None
+        email = payload.get("sub")
+        if payload.get("scope") != "access_token" or email is None:
+            return None
+        self.token_cache[key] = (email, payload["exp"])
+        return email
+
+    async def get_cached_user(self, email: str) -> User | None:
+        """
+        Retrieves a user from the Redis cache.
+
+        :param email: The email address of the user.
+        :type email: str
+        :return: A detached user built from the cached fields, or None on a cache miss or when Redis
+            is unavailable.
+        :rtype: User | None
+        """
+        try:
+            cached_user = await self.r.get(f"user:{email}")
+        except RedisError as err:
+            print(err)
+            return None
+        if cached_user is None:
+            return None
+        data = json.loads(cached_user)
+        data["created_at"] = datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
+        return User(**data)
+
+    async def cache_user(self, user: User) -> None:
+        """
+        Stores the fields needed by authenticated endpoints in the Redis cache.
+
+        The password hash and the refresh token are never cached.
+
+        :param user: The user to cache.
+        :type user: User
+        """
+        data = {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "avatar": user.avatar,
+            "confirmed": user.confirmed,
+        }
+        try:
+            await self.r.setex(f"user:{user.email}", self.USER_CACHE_TTL, json.dumps(data))
+        except RedisError as err:
+            print(err)
+
+    async def drop_cached_user(self, email: str) -> None:
+        """
+        Removes a user from the Redis cache after their data has changed.
+
+        :param email: The email address of the user.
+        :type email: str
+        """
+        try:
+            await self.r.delete(f"user:{email}")
+        except RedisError as err:
+            print(err)
     
     def create_email_token(self, data: dict) -> str:
         """
@@ -143,7 +259,7 @@ class Auth:
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=7)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire})
-        token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        token = jwt.encode(to_encode, self.SIGNING_KEY, algorithm=self.ALGORITHM)
         return token
 
     async def get_email_from_token(self, token: str) -> str:
@@ -157,7 +273,7 @@ class Auth:
         :raises HTTPException: If the token is invalid.
         """
       try:
-          payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+          payload = jwt.decode(token, self.SIGNING_KEY, algorithms=[self.ALGORITHM])
           email = payload["sub"]
           return email
       except JWTError as e:
@@ -0,0 +1,37 @@
+import asyncio
+
+import cloudinary
+import cloudinary.uploader
+
+from src.database.db import SessionLocal
+from src.repository import users as repository_users
+from src.services.auth import auth_service
+
+
+async def upload_avatar(image: bytes, username: str, email: str):
+    """
+    Uploads an avatar image to Cloudinary and stores the resulting URL for the user.
+
+    This function runs as a background task after the avatar request has been answered, so it
+    opens its own database session. The blocking Cloudinary upload runs in a worker thread. If the
+    upload or the update fails, the error is printed and the user keeps their previous avatar.
+
+    :param image: The raw bytes of the uploaded image.
+    :type image: bytes
+    :param username: The username used to build the Cloudinary public ID.
+    :type username: str
+    :param email: The email address of the user whose avatar is updated.
+    :type email: str
+    :return: None
+    """
+    public_id = f'NotesApp/{username}'
+    try:
+        r = await asyncio.to_thread(cloudinary.uploader.upload, image, public_id=public_id, overwrite=True)
+        src_url = cloudinary.CloudinaryImage(public_id)\
+                            .build_url(width=250, height=250, crop='fill', version=r.get('version'))
+        async with SessionLocal() as db:
+            await repository_users.update_avatar(email, src_url, db)
+    except Exception as err:
+        print(err)
+        return
+    await auth_service.drop_cached_user(email)
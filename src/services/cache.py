@@ -0,0 +1,77 @@
+from functools import wraps
+
+from fastapi import Response
+
+from redis.exceptions import RedisError
+
+from src.database.db import get_redis
+
+
+r = get_redis()
+
+
+def user_keys_key(user_id: int) -> str:
+    """
+    Builds the name of the Redis set that tracks every cached response of a user.
+
+    :param user_id: The ID of the user.
+    :type user_id: int
+    :return: The Redis key of the set.
+    :rtype: str
+    """
+    return f"contacts:{user_id}:keys"
+
+
+def redis_cache(ttl: int = 30):
+    """
+    Caches the JSON body of a GET endpoint in Redis, per user and query parameters.
+
+    The decorated endpoint must take ``current_user`` and return a ``Response`` with a JSON body.
+    On a cache hit the stored body is returned as is, skipping the database and serialization.
+    Every key is also added to the user's key set, so ``invalidate_user_cache`` can drop them all
+    without a ``SCAN``. If Redis is unavailable the endpoint is simply called uncached.
+
+    :param ttl: The number of seconds a cached response stays valid.
+    :type ttl: int
+    :return: The endpoint decorator.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            user_id = kwargs["current_user"].id
+            params = "&".join(f"{name}={value}" for name, value in sorted(kwargs.items()) if name not in ("db", "current_user"))
+            key = f"contacts:{user_id}:{func.__name__}:{params}"
+            try:
+                cached = await r.get(key)
+            except RedisError as err:
+                print(err)
+                return await func(*args, **kwargs)
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+            response = await func(*args, **kwargs)
+            if response.status_code == 200:
+                try:
+                    async with r.pipeline(transaction=False) as pipe:
+                        pipe.setex(key, ttl, response.body)
+                        pipe.sadd(user_keys_key(user_id), key)
+                        pipe.expire(user_keys_key(user_id), ttl)
+                        await pipe.execute()
+                except RedisError as err:
+                    print(err)
+            return response
+        return wrapper
+    return decorator
+
+
+async def invalidate_user_cache(user_id: int) -> None:
+    """
+    Drops every cached response of a user after their contacts have changed.
+
+    :param user_id: The ID of the user.
+    :type user_id: int
+    """
+    try:
+        keys = await r.smembers(user_keys_key(user_id))
+        await r.delete(user_keys_key(user_id), *keys)
+    except RedisError as err:
+        print(err)
\ No newline at end of file
@@ -1,6 +1,18 @@
+import asyncio
+from contextvars import ContextVar
 from pathlib import Path
 
+import aiosmtplib
+
+from cachetools import TTLCache
+
+from jinja2 import Environment, FileSystemLoader
+
+from fastapi import BackgroundTasks
+
+import fastapi_mail.fastmail
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from fastapi_mail.connection import Connection
 from fastapi_mail.errors import ConnectionErrors
 
 from pydantic import EmailStr
@@ -9,6 +21,8 @@ from src.services.auth import auth_service
 from src.conf.config import settings
 
 
+TEMPLATE_FOLDER = Path(__file__).parent / 'templates'
+
 conf = ConnectionConfig(
     MAIL_USERNAME=settings.mail_username,
     MAIL_PASSWORD=settings.mail_password,
@@ -17,12 +31,159 @@ conf = ConnectionConfig(
     MAIL_SERVER=settings.mail_server,
     MAIL_STARTTLS=True,
     MAIL_SSL_TLS=False,
-    TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
+    TEMPLATE_FOLDER=TEMPLATE_FOLDER,
 )
 
-async def send_email(email: EmailStr, username: str, host: str):
+# Compiled once at import; fastapi-mail would otherwise rebuild the environment and reload the
+# template on every send.
+template_env = Environment(loader=FileSystemLoader(TEMPLATE_FOLDER), auto_reload=False)
+email_template = template_env.get_template('email_template.html')
+
+# Verification tokens are valid for 7 days; a cached token is reused for at most one day,
+# so a resent link always stays valid for at least 6 more days.
+EMAIL_TOKEN_CACHE_TTL = 24 * 60 * 60
+email_tokens = TTLCache(maxsize=4096, ttl=EMAIL_TOKEN_CACHE_TTL)
+
+
+def get_email_token(email: str) -> str:
+    """
+    Returns an email verification token for the given address, reusing a recently signed one.
+
+    :param email: The email address the token is issued for.
+    :type email: str
+    :return: The encoded email verification token.
+    :rtype: str
+    """
+    token = email_tokens.get(email)
+    if token is None:
+        token = auth_service.create_email_token({"sub": email})
+        email_tokens[email] = token
+    return token
+
+
+class SMTPPool:
+    """
+    Keeps logged-in SMTP connections open between sends, so the TLS handshake and the login are
+    paid once per connection instead of once per message.
+
+    At most ``size`` connections are in use at a time; a connection is closed and replaced after
+    ``max_messages`` messages or as soon as a send through it fails.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int = 5, max_messages: int = 100):
+        self.config = config
+        self.max_messages = max_messages
+        self.semaphore = asyncio.Semaphore(size)
+        self.idle: list[tuple[aiosmtplib.SMTP, int]] = []
+
+    async def acquire(self) -> tuple[aiosmtplib.SMTP, int]:
+        """
+        Takes an idle connection from the pool or opens a new one.
+
+        :return: The connection and the number of messages already sent through it.
+        :rtype: tuple[aiosmtplib.SMTP, int]
+        :raises ConnectionErrors: If a new connection cannot be established.
+        """
+        await self.semaphore.acquire()
+        while self.idle:
+            smtp, sent = self.idle.pop()
+            if smtp.is_connected:
+                return smtp, sent
+        try:
+            return await self.connect(), 0
+        except Exception:
+            self.semaphore.release()
+            raise
+
+    async def release(self, smtp: aiosmtplib.SMTP, sent: int, broken: bool = False) -> None:
+        """
+        Returns a connection to the pool, or closes it if it failed or reached ``max_messages``.
+
+        :param smtp: The connection to return.
+        :type smtp: aiosmtplib.SMTP
+        :param sent: The number of messages sent through the connection so far.
+        :type sent: int
+        :param broken: Whether the last send through the connection failed.
+        :type broken: bool
+        """
+        try:
+            if broken or sent >= self.max_messages or not smtp.is_connected:
+                await self.quit(smtp)
+            else:
+                self.idle.append((smtp, sent))
+        finally:
+            self.semaphore.release()
+
+    async def connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            timeout=self.config.TIMEOUT,
+            port=self.config.MAIL_PORT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD)
+        except Exception as error:
+            raise ConnectionErrors(
+                f"Exception raised {error}, check your credentials or email service configuration"
+            )
+        return smtp
+
+    @staticmethod
+    async def quit(smtp: aiosmtplib.SMTP) -> None:
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def close(self) -> None:
+        """
+        Closes all idle connections. Called on application shutdown.
+        """
+        while self.idle:
+            smtp, _ = self.idle.pop()
+            await self.quit(smtp)
+
+
+smtp_pool = SMTPPool(conf)
+
+# Set by send_emails_bulk while it holds one SMTP session for a whole batch.
+pinned_session: ContextVar[aiosmtplib.SMTP | None] = ContextVar("pinned_session", default=None)
+
+
+class PooledConnection(Connection):
     """
-    Sends an email to the given email address with a confirmation link.
+    fastapi-mail ``Connection`` that borrows an SMTP session from ``smtp_pool`` instead of opening
+    and quitting a new one for every message. Inside ``send_emails_bulk`` it uses the session the
+    batch is holding and leaves releasing it to the batch.
+    """
+
+    async def _configure_connection(self) -> None:
+        self.pinned = pinned_session.get()
+        if self.settings.SUPPRESS_SEND:
+            return await super()._configure_connection()
+        if self.pinned is not None:
+            self.session = self.pinned
+            return
+        self.session, self.sent = await smtp_pool.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if not self.settings.SUPPRESS_SEND and self.pinned is None:
+            await smtp_pool.release(self.session, self.sent + 1, broken=exc_type is not None)
+
+
+# FastMail.send_message looks Connection up in its own module on every call.
+fastapi_mail.fastmail.Connection = PooledConnection
+fm = FastMail(conf)
+
+
+def confirmation_message(email: EmailStr, username: str, host: str) -> MessageSchema:
+    """
+    Builds the confirmation email for the given recipient.
 
     :param email: The email address of the recipient.
     :type email: EmailStr
@@ -30,19 +191,177 @@ async def send_email(email: EmailStr, username: str, host: str):
     :type username: str
     :param host: The hostname of the server hosting the application.
     :type host: str
-    :return: None
-    :raises ConnectionErrors: If there was an error connecting to the mail server.
+    :return: The message with the rendered confirmation link.
+    :rtype: MessageSchema
     """
-    try:
-        token_verification = auth_service.create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email ",
-            recipients=[email],
-            template_body={"host": host, "username": username, "token": token_verification},
-            subtype=MessageType.html
-        )
+    token_verification = get_email_token(email)
+    return MessageSchema(
+        subject="Confirm your email ",
+        recipients=[email],
+        body=email_template.render(host=host, username=username, token=token_verification),
+        subtype=MessageType.html
+    )
+
+
+# A batch of at least BULK_MIN_ABORT_SIZE messages is abandoned once more than a third of it
+# has failed, since the rest would most likely fail the same way.
+BULK_MIN_ABORT_SIZE = 30
+
+
+async def send_emails_bulk(emails: list[tuple[EmailStr, str, str]]) -> list[EmailStr]:
+    """
+    Sends confirmation emails to several recipients through a single SMTP session.
 
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="email_template.html")
+    :param emails: The (email, username, host) of every recipient.
+    :type emails: list[tuple[EmailStr, str, str]]
+    :return: The email addresses that were not sent, either because sending failed or because
+        the batch was aborted.
+    :rtype: list[EmailStr]
+    """
+    if not emails:
+        return []
+    try:
+        smtp, sent = await smtp_pool.acquire()
     except ConnectionErrors as err:
-        print(err)
\ No newline at end of file
+        print(err)
+        return [email for email, _, _ in emails]
+
+    failed = []
+    token = pinned_session.set(smtp)
+    try:
+        for index, (email, username, host) in enumerate(emails):
+            if len(emails) >= BULK_MIN_ABORT_SIZE and len(failed) > len(emails) // 3:
+                failed.extend(email for email, _, _ in emails[index:])
+                break
+            try:
+                await fm.send_message(confirmation_message(email, username, host))
+                sent += 1
+            except Exception as err:
+                # Covers invalid addresses rejected by MessageSchema as well as SMTP errors,
+                # so one bad recipient never drops the rest of the batch.
+                print(err)
+                failed.append(email)
+                if smtp.is_connected:
+                    continue
+                await smtp_pool.release(smtp, sent, broken=True)
+                smtp = None
+                try:
+                    smtp, sent = await smtp_pool.acquire()
+                except ConnectionErrors as err:
+                    print(err)
+                    failed.extend(email for email, _, _ in emails[index + 1:])
+                    break
+                pinned_session.set(smtp)
+    finally:
+        pinned_session.reset(token)
+        if smtp is not None:
+            await smtp_pool.release(smtp, sent)
+    return failed
+
+
+class EmailWorker:
+    """
+    Sends queued confirmation emails from a single long-running task.
+
+    The worker takes up to ``batch_size`` emails at a time, waiting ``batch_wait`` seconds for more
+    to arrive while the queue is empty, and sends each batch with ``send_emails_bulk``.
+    """
+
+    def __init__(self, batch_size: int = 32, batch_wait: float = 0.1, maxsize: int = 10000):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue: asyncio.Queue[tuple[EmailStr, str, str]] = asyncio.Queue(maxsize=maxsize)
+        self.task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self) -> None:
+        """
+        Starts the worker task. Called on application startup.
+        """
+        if not self.running:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 30) -> None:
+        """
+        Waits for the queued emails to be sent, then stops the worker. Called on application shutdown.
+
+        :param timeout: How long to wait for the queue to drain, in seconds.
+        :type timeout: float
+        """
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Email worker stopped with {self.queue.qsize()} emails unsent")
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+    async def put(self, emails: list[tuple[EmailStr, str, str]]) -> None:
+        """
+        Queues emails for the worker, or sends them right away if the worker is not running.
+
+        :param emails: The (email, username, host) of every recipient.
+        :type emails: list[tuple[EmailStr, str, str]]
+        """
+        if not self.running:
+            if emails:
+                await self.send(emails)
+            return
+        for item in emails:
+            await self.queue.put(item)
+
+    async def run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size:
+                if self.queue.empty():
+                    await asyncio.sleep(self.batch_wait)
+                    if self.queue.empty():
+                        break
+                batch.append(self.queue.get_nowait())
+            try:
+                await self.send(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    @staticmethod
+    async def send(batch: list[tuple[EmailStr, str, str]]) -> None:
+        """
+        Sends a batch with ``send_emails_bulk`` and logs the addresses that were not sent.
+
+        :param batch: The (email, username, host) of every recipient.
+        :type batch: list[tuple[EmailStr, str, str]]
+        """
+        try:
+            failed = await send_emails_bulk(batch)
+        except Exception as err:
+            print(err)
+            failed = [email for email, _, _ in batch]
+        if failed:
+            print(f"Confirmation emails not sent to: {', '.join(failed)}")
+
+
+email_worker = EmailWorker()
+
+
+async def get_email_queue(background_tasks: BackgroundTasks) -> list[tuple[EmailStr, str, str]]:
+    """
+    Dependency returning a per-request list of confirmation emails to send. The list is handed to
+    ``email_worker`` in a background task once the response has been sent.
+
+    :param background_tasks: Background tasks of the current request.
+    :type background_tasks: BackgroundTasks
+    :return: The queue to append (email, username, host) tuples to.
+    :rtype: list[tuple[EmailStr, str, str]]
+    """
+    queue = []
+    background_tasks.add_task(email_worker.put, queue)
+    return queue
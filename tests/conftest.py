@@ -1,9 +1,17 @@
 import pytest
 
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 
+from passlib.context import CryptContext
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 import sys
 import os
@@ -12,15 +20,86 @@ from main import app
 
 from src.database.models import Base
 from src.database.db import get_db
+from src.services.auth import auth_service
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# TestClient runs every request in its own event loop, so async connections must not be pooled
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine)
+
+# bcrypt's default cost dominates the route tests; the minimum cost exercises the same code paths
+fast_pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+class FakeRedis:
+    """In-memory stand-in for the async Redis client used by the user and response caches."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value.decode() if isinstance(value, bytes) else value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def sadd(self, key, *members):
+        self.store.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    async def expire(self, key, ttl):
+        pass
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((getattr(self.redis, name), args))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await command(*args) for command, args in self.commands]
+
+
+class UnavailableRedis(FakeRedis):
+    """Redis client whose every command fails, as during a Redis outage."""
+
+    def __getattribute__(self, name):
+        if name in ("pipeline", "store"):
+            return super().__getattribute__(name)
+
+        async def unavailable(*args):
+            raise RedisConnectionError("Connection refused")
+        return unavailable
+
 
 @pytest.fixture(scope="module")
 def session():
@@ -38,17 +117,25 @@ def session():
 @pytest.fixture(scope="module")
 def client(session):
 
-    def override_get_db():
-        try:
-            yield session
-        finally:
-            session.close()
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
 
-    yield TestClient(app)
+    fake_redis = FakeRedis()
+    with patch.object(auth_service, "r", fake_redis), patch("src.services.cache.r", fake_redis), \
+            patch.object(auth_service, "pwd_context", fast_pwd_context):
+        yield TestClient(app)
 
 
 @pytest.fixture(scope="module")
 def user():
     return {"username": "deadpool", "email": "deadpool@example.com", "password": "123456789"}
+
+
+@pytest.fixture()
+def unavailable_redis():
+    redis = UnavailableRedis()
+    with patch.object(auth_service, "r", redis), patch("src.services.cache.r", redis):
+        yield redis
@@ -1,4 +1,5 @@
 from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
 
 import sys
 import os
@@ -12,4 +13,8 @@ client = TestClient(app)
 def test_read_main():
     response = client.get("/")
     assert response.status_code == 200
-    assert response.json() == {"message": "Welcome to FastAPI!"}
\ No newline at end of file
+    assert response.json() == {"message": "Welcome to FastAPI!"}
+
+
+def test_middleware_is_pure_asgi():
+    assert not any(issubclass(middleware.cls, BaseHTTPMiddleware) for middleware in app.user_middleware)
\ No newline at end of file
@@ -1,10 +1,14 @@
 import pytest
 
+from datetime import date
+
 from fastapi import status
 
+from main import app
 from src.database.models import User
+from src.routes.contacts import read_contacts_limiter
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 
 
 @pytest.fixture(scope="module")
@@ -17,10 +21,17 @@ def test_contact_update():
     return {"first_name": "Jane", "last_name": "Doe", "email": "jane.doe@example.com", "phone_number": "0987654321", "birth_date": "1991-02-02"}
 
 
+@pytest.fixture()
+def no_rate_limit():
+    app.dependency_overrides[read_contacts_limiter] = lambda: None
+    yield
+    app.dependency_overrides.pop(read_contacts_limiter)
+
+
 @pytest.fixture()
 def token(client, user, session, monkeypatch):
-    mock_send_email = MagicMock()
-    monkeypatch.setattr("src.routes.users.send_email", mock_send_email)
+    mock_send_email = AsyncMock()
+    monkeypatch.setattr("src.services.email.send_emails_bulk", mock_send_email)
     client.post("/api/auth/signup", json=user)
     current_user: User = session.query(User).filter(User.email == user.get('email')).first()
     current_user.confirmed = True
@@ -60,6 +71,33 @@ def test_create_contact_duplicate_email(client, token, test_contact):
     assert response.json()["detail"] == "Contact with this email already exists."
 
 
+def test_update_contact_duplicate_email(client, token, test_contact, test_contact_update):
+    response = client.post(
+        "/api/contacts/create",
+        json=test_contact_update,
+        headers={"Authorization": f"Bearer {token}"},
+        )
+    contact_id = response.json()["id"]
+
+    response = client.put(
+        f"/api/contacts/update_contact/{contact_id}",
+        json={**test_contact_update, "email": test_contact["email"].upper()},
+        headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Contact with this email already exists."
+
+    response = client.put(
+        f"/api/contacts/update_contact/{contact_id}",
+        json={**test_contact_update, "phone_number": "1112223333"},
+        headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["phone_number"] == "1112223333"
+
+
 def test_search_contacts(client, token, test_contact):
     response = client.get(f"/api/contacts/search?first_name={test_contact['first_name']}", headers={"Authorization": f"Bearer {token}"})
     assert response.status_code == status.HTTP_200_OK
@@ -73,4 +111,57 @@ def test_get_upcoming_birthdays(client, token):
     response = client.get("/api/contacts/birthdays", headers={"Authorization": f"Bearer {token}"})
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
-    assert isinstance(data, list)
\ No newline at end of file
+    assert isinstance(data, list)
+
+
+def test_get_upcoming_birthdays_after_create(client, token):
+    client.get("/api/contacts/birthdays", headers={"Authorization": f"Bearer {token}"})
+    birthday = date.today().replace(year=1996)
+    client.post(
+        "/api/contacts/create",
+        json={"first_name": "Birthday", "last_name": "Today", "email": "birthday@example.com", "phone_number": "1234567890", "birth_date": birthday.isoformat()},
+        headers={"Authorization": f"Bearer {token}"},
+        )
+    response = client.get("/api/contacts/birthdays", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert "Birthday" in [contact["first_name"] for contact in response.json()]
+
+
+def test_get_upcoming_birthdays_redis_unavailable(client, token, unavailable_redis):
+    response = client.get("/api/contacts/birthdays", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert "Birthday" in [contact["first_name"] for contact in response.json()]
+
+    response = client.post(
+        "/api/contacts/create",
+        json={"first_name": "Outage", "last_name": "Test", "email": "outage@example.com", "phone_number": "1234567890", "birth_date": "1990-01-01"},
+        headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_read_contacts_pages(client, token, no_rate_limit):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get("/api/contacts/read_contacts?limit=100", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    contact_ids = [contact["id"] for contact in response.json()["items"]]
+    assert response.json()["next_cursor"] is None
+    assert len(contact_ids) == 4
+
+    response = client.get("/api/contacts/read_contacts?limit=2", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [contact["id"] for contact in data["items"]] == contact_ids[:2]
+    assert data["next_cursor"] == contact_ids[1]
+
+    response = client.get(f"/api/contacts/read_contacts?limit=2&after_id={data['next_cursor']}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [contact["id"] for contact in data["items"]] == contact_ids[2:]
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.parametrize("limit", [0, 101])
+def test_read_contacts_limit_out_of_range(client, token, no_rate_limit, limit):
+    response = client.get(f"/api/contacts/read_contacts?limit={limit}", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,13 +1,14 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from src.database.models import User
+from src.services.auth import auth_service
 
 import pytest
 
 
 def test_create_user(client, user, monkeypatch):
-    mock_send_email = MagicMock()
-    monkeypatch.setattr("src.routes.users.send_email", mock_send_email)
+    mock_send_email = AsyncMock()
+    monkeypatch.setattr("src.services.email.send_emails_bulk", mock_send_email)
 
     response = client.post(
         "/api/auth/signup", 
@@ -19,6 +20,8 @@ def test_create_user(client, user, monkeypatch):
     assert data["user"]["email"] == user.get("email")
     assert data["user"]["username"] == user["username"]
     assert "id" in data["user"]
+    [(email, username, _)] = mock_send_email.await_args.args[0]
+    assert (email, username) == (user["email"], user["username"])
 
 
 def test_repeat_create_user(client, user):
@@ -58,6 +61,18 @@ def test_login_user(client, session, user):
     assert data["token_type"] == "bearer"
 
 
+def test_login_user_skips_bcrypt_when_recently_verified(client, user, monkeypatch):
+    credentials = {"username": user.get('email'), "password": user.get('password')}
+    assert client.post("/api/auth/login", data=credentials).status_code == 200
+
+    mock_verify = MagicMock(return_value=False)
+    monkeypatch.setattr(auth_service.pwd_context, "verify", mock_verify)
+    response = client.post("/api/auth/login", data=credentials)
+
+    assert response.status_code == 200, response.text
+    mock_verify.assert_not_called()
+
+
 def test_login_wrong_password(client, user):
     response = client.post(
         "/api/auth/login",
@@ -109,4 +124,39 @@ def test_get_user_me_without_token(client):
     
     assert response.status_code == 401
     data = response.json()
-    assert data["detail"] == "Not authenticated"
\ No newline at end of file
+    assert data["detail"] == "Not authenticated"
+
+
+def test_get_user_me_cached_token_expired(client, access_token, monkeypatch):
+    response = client.get("/api/auth/me/", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+
+    monkeypatch.setattr("src.services.auth.time.time", lambda: 2 ** 40)
+    response = client.get("/api/auth/me/", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Could not validate credentials"
+
+
+def test_get_user_me_redis_unavailable(client, access_token, unavailable_redis):
+    response = client.get("/api/auth/me/", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.status_code == 200, response.text
+    assert "email" in response.json()
+
+
+def test_update_avatar_user(client, user, access_token, monkeypatch):
+    mock_upload_avatar = AsyncMock()
+    monkeypatch.setattr("src.routes.users.upload_avatar", mock_upload_avatar)
+
+    response = client.patch(
+        "/api/auth/avatar",
+        files={"file": ("avatar.png", b"image-bytes", "image/png")},
+        headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+    assert response.status_code == 202, response.text
+    data = response.json()
+    assert data["email"] == user["email"]
+    assert data["avatar_status"] == "pending"
+    mock_upload_avatar.assert_awaited_once_with(b"image-bytes", user["username"], user["email"])
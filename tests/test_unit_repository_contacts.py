@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from src.database.models import Contact, User
 from src.schemas import ContactCreate, ContactUpdate
@@ -8,98 +9,175 @@ from src.repository.contacts import (
     get_contacts,
     get_contact,
     create_contact,
+    bulk_create_contacts,
     update_contact,
     remove_contact,
     search_contact,
     get_upcoming_birthdays,
+    upcoming_birthday_days,
 )
 
 
 class TestContacts(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
         self.user = User(id=1)
 
     async def test_get_contacts(self):
         contacts = [Contact(), Contact(), Contact()]
-        self.session.query().filter().offset().limit().all.return_value = contacts
-        result = await get_contacts(skip=0, limit=10, user=self.user, db=self.session)
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = contacts
+        self.session.execute.return_value = mocked_result
+        result = await get_contacts(after_id=None, limit=10, user=self.user, db=self.session)
         self.assertEqual(result, contacts)
 
+    async def test_get_contacts_after_cursor(self):
+        contacts = [Contact(id=4), Contact(id=5)]
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = contacts
+        self.session.execute.return_value = mocked_result
+        result = await get_contacts(after_id=3, limit=10, user=self.user, db=self.session)
+        self.assertEqual(result, contacts)
+        stmt = self.session.execute.call_args[0][0]
+        self.assertIn("contacts.id >", str(stmt))
+        self.assertIn("ORDER BY contacts.id", str(stmt))
+        self.assertEqual(stmt.compile().params["param_1"], 11)
+
     async def test_get_contact_found(self):
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = contact
+        self.session.execute.return_value = mocked_result
         result = await get_contact(contact_id=1, user=self.user, db=self.session)
         self.assertEqual(result, contact)
 
     async def test_get_contact_not_found(self):
-        self.session.query().filter().first.return_value = None
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = None
+        self.session.execute.return_value = mocked_result
         result = await get_contact(contact_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_create_contact(self):
         body = ContactCreate(first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890", birth_date=date(1990, 1, 1))
+        mocked_result = MagicMock()
+        mocked_result.first.return_value = Contact(id=1, **body.model_dump(), owner_id=self.user.id)
+        self.session.execute.return_value = mocked_result
         result = await create_contact(body=body, user=self.user, db=self.session)
         self.assertEqual(result.first_name, body.first_name)
         self.assertEqual(result.last_name, body.last_name)
         self.assertEqual(result.email, body.email)
         self.assertTrue(hasattr(result, "id"))
 
+    async def test_create_contact_duplicate_email(self):
+        body = ContactCreate(first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890", birth_date=date(1990, 1, 1))
+        mocked_result = MagicMock()
+        mocked_result.first.return_value = None
+        self.session.execute.return_value = mocked_result
+        result = await create_contact(body=body, user=self.user, db=self.session)
+        self.assertIsNone(result)
+
+    async def test_bulk_create_contacts(self):
+        bodies = [
+            ContactCreate(first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890", birth_date=date(1990, 1, 1)),
+            ContactCreate(first_name="Jane", last_name="Doe", email="jane@example.com", phone_number="1234567891", birth_date=date(1991, 2, 2)),
+        ]
+        contacts = [Contact(id=1), Contact(id=2)]
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = contacts
+        self.session.execute.return_value = mocked_result
+        result = await bulk_create_contacts(bodies=bodies, user=self.user, db=self.session)
+        self.assertEqual(result, contacts)
+        self.session.execute.assert_awaited_once()
+        self.session.commit.assert_awaited_once()
+
     async def test_update_contact_found(self):
         body = ContactUpdate(first_name="Jane", last_name="Doe", email="jane@example.com", phone_number="1234567890", birth_date=date(1990, 1, 1))
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = contact
+        self.session.execute.return_value = mocked_result
         result = await update_contact(contact_id=1, body=body, user=self.user, db=self.session)
         self.assertEqual(result, contact)
 
+    async def test_update_contact_duplicate_email(self):
+        body = ContactUpdate(first_name="Jane", last_name="Doe", email="jane@example.com", phone_number="1234567890", birth_date=date(1990, 1, 1))
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = Contact()
+        self.session.execute.return_value = mocked_result
+        self.session.commit.side_effect = IntegrityError("UPDATE contacts", {}, Exception("UNIQUE constraint failed"))
+        with self.assertRaises(IntegrityError):
+            await update_contact(contact_id=1, body=body, user=self.user, db=self.session)
+        self.session.rollback.assert_awaited_once()
+
     async def test_update_contact_not_found(self):
         body = ContactUpdate(first_name="Jane", last_name="Doe", email="jane@example.com", phone_number="1234567890", birth_date=date(1990, 1, 1))
-        self.session.query().filter().first.return_value = None
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = None
+        self.session.execute.return_value = mocked_result
         result = await update_contact(contact_id=1, body=body, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_remove_contact_found(self):
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = contact
+        self.session.execute.return_value = mocked_result
         result = await remove_contact(contact_id=1, user=self.user, db=self.session)
         self.assertEqual(result, contact)
 
     async def test_remove_contact_not_found(self):
-        self.session.query().filter().first.return_value = None
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = None
+        self.session.execute.return_value = mocked_result
         result = await remove_contact(contact_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_search_contact_by_first_name(self):
         contact = Contact(first_name="John", last_name="Doe", email="john@example.com")
-        self.session.query().filter().filter().all.return_value = [contact]
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = [contact]
+        self.session.execute.return_value = mocked_result
         result = await search_contact(first_name="John", last_name=None, email=None, user=self.user, db=self.session)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].first_name, contact.first_name)
 
     async def test_search_contact_by_last_name(self):
         contact = Contact(first_name="Jane", last_name="Smith", email="jane@example.com")
-        self.session.query().filter().filter().all.return_value = [contact]
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = [contact]
+        self.session.execute.return_value = mocked_result
         result = await search_contact(first_name="", last_name="Smith", email="", user=self.user, db=self.session)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].last_name, contact.last_name)
 
     async def test_search_contact_by_email(self):
         contact = Contact(first_name="Alice", last_name="Johnson", email="alice@example.com")
-        self.session.query().filter().filter().all.return_value = [contact]
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = [contact]
+        self.session.execute.return_value = mocked_result
         result = await search_contact(first_name="", last_name="", email="alice@example.com", user=self.user, db=self.session)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].email, contact.email)
 
     async def test_search_contact_multiple_criteria(self):
         contact = Contact(first_name="Bob", last_name="Brown", email="bob@example.com")
-        self.session.query().filter().filter().filter().all.return_value = [contact]
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = [contact]
+        self.session.execute.return_value = mocked_result
         result = await search_contact(first_name="Bob", last_name="Brown", email="", user=self.user, db=self.session)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].first_name, "Bob")
         self.assertEqual(result[0].last_name, "Brown")
+        stmt = self.session.execute.call_args[0][0]
+        where = str(stmt.whereclause)
+        self.assertEqual(where.count(" AND "), 2)
+        self.assertNotIn("email", where)
 
     async def test_search_contact_no_results(self):
-        self.session.query().filter().all.return_value = []
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = []
+        self.session.execute.return_value = mocked_result
         result = await search_contact(first_name="", last_name="", email="", user=self.user, db=self.session)
         self.assertEqual(len(result), 0)
 
@@ -108,22 +186,41 @@ class TestContacts(unittest.IsolatedAsyncioTestCase):
             Contact(first_name="John", last_name="Doe", email="john@example.com"),
             Contact(first_name="Johnny", last_name="Smith", email="johnny@example.com")
         ]
-        self.session.query().filter().filter().all.return_value = contacts
+        mocked_result = MagicMock()
+        mocked_result.all.return_value = contacts
+        self.session.execute.return_value = mocked_result
         result = await search_contact(first_name="John", last_name="", email="", user=self.user, db=self.session)
         self.assertEqual(len(result), 2)
         self.assertTrue(all("John" in contact.first_name for contact in result))
 
     async def test_get_upcoming_birthdays_found(self):
         contacts = [Contact(birth_date=date.today()), Contact(birth_date=date.today())]
-        self.session.query().filter().all.return_value = contacts
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.all.return_value = contacts
+        self.session.execute.return_value = mocked_result
         result = await get_upcoming_birthdays(user=self.user, db=self.session)
         self.assertEqual(result, contacts)
 
     async def test_get_upcoming_birthdays_not_found(self):
-        self.session.query().filter().all.return_value = []
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.all.return_value = []
+        self.session.execute.return_value = mocked_result
         result = await get_upcoming_birthdays(user=self.user, db=self.session)
         self.assertEqual(result, [])
-    
+
+    def test_upcoming_birthday_days_across_new_year(self):
+        result = upcoming_birthday_days(date(2026, 12, 29))
+        self.assertEqual(result, [(12, 29), (12, 30), (12, 31), (1, 1), (1, 2), (1, 3), (1, 4)])
+
+    def test_upcoming_birthday_days_include_feb_29_in_common_year(self):
+        self.assertIn((2, 29), upcoming_birthday_days(date(2027, 2, 22)))
+        self.assertIn((2, 29), upcoming_birthday_days(date(2027, 3, 1)))
+        self.assertNotIn((2, 29), upcoming_birthday_days(date(2027, 3, 2)))
+
+    def test_upcoming_birthday_days_in_leap_year(self):
+        result = upcoming_birthday_days(date(2028, 2, 26))
+        self.assertEqual(result, [(2, 26), (2, 27), (2, 28), (2, 29), (3, 1), (3, 2), (3, 3)])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
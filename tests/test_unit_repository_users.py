@@ -1,10 +1,12 @@
 import unittest
-from unittest.mock import MagicMock, patch
-from sqlalchemy.orm import Session
+from unittest.mock import MagicMock
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import User
 from src.schemas import UserModel
 from src.repository.users import (
     get_user_by_email,
+    get_auth_user_by_email,
     create_user,
     update_token,
     confirmed_email,
@@ -14,33 +16,55 @@ from src.repository.users import (
 
 class TestUsers(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
 
     async def test_get_user_by_email_found(self):
         user = User(email="test@example.com")
-        self.session.query().filter().first.return_value = user
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = user
+        self.session.execute.return_value = mocked_result
         result = await get_user_by_email(email="test@example.com", db=self.session)
         self.assertEqual(result, user)
 
     async def test_get_user_by_email_not_found(self):
-        self.session.query().filter().first.return_value = None
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = None
+        self.session.execute.return_value = mocked_result
         result = await get_user_by_email(email="test@example.com", db=self.session)
         self.assertIsNone(result)
 
-    @patch('src.repository.users.Gravatar')
-    async def test_create_user(self, mock_gravatar):
-        mock_gravatar.return_value.get_image.return_value = "avatar_url"
+    async def test_get_auth_user_by_email_found(self):
+        mocked_result = MagicMock()
+        mocked_result.mappings.return_value.first.return_value = {"id": 1, "email": "test@example.com", "confirmed": True}
+        self.session.execute.return_value = mocked_result
+        result = await get_auth_user_by_email(email="test@example.com", db=self.session)
+        self.assertEqual(result.id, 1)
+        self.assertEqual(result.email, "test@example.com")
+        self.assertIsNone(result.password)
+        stmt = self.session.execute.call_args[0][0]
+        self.assertNotIn("password", str(stmt))
+
+    async def test_get_auth_user_by_email_not_found(self):
+        mocked_result = MagicMock()
+        mocked_result.mappings.return_value.first.return_value = None
+        self.session.execute.return_value = mocked_result
+        result = await get_auth_user_by_email(email="test@example.com", db=self.session)
+        self.assertIsNone(result)
+
+    async def test_create_user(self):
         body = UserModel(username="testuser", email="test@example.com", password="password")
-        self.session.query().filter().first.return_value = None
         result = await create_user(body=body, db=self.session)
+        self.session.execute.assert_not_called()
         self.assertEqual(result.email, body.email)
+        self.assertEqual(result.avatar, "https://www.gravatar.com/avatar/55502f40dc8b7c769880b10874abc9d0?d=identicon")
         self.assertTrue(hasattr(result, "id"))
 
     async def test_create_user_existing(self):
         body = UserModel(username="testuser", email="test@example.com", password="password")
-        self.session.query().filter().first.return_value = User()
+        self.session.commit.side_effect = IntegrityError("INSERT INTO users", {}, Exception("UNIQUE constraint failed: users.email"))
         result = await create_user(body=body, db=self.session)
         self.assertIsNone(result)
+        self.session.rollback.assert_awaited_once()
 
     async def test_update_token(self):
         user = User()
@@ -48,17 +72,18 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(user.refresh_token, "new_token")
 
     async def test_confirmed_email(self):
-        user = User(email="test@example.com", confirmed=False)
-        self.session.query().filter().first.return_value = user
         await confirmed_email(email="test@example.com", db=self.session)
-        self.assertTrue(user.confirmed)
+        self.session.execute.assert_awaited_once()
+        self.session.commit.assert_awaited_once()
 
     async def test_update_avatar(self):
-        user = User(email="test@example.com")
-        self.session.query().filter().first.return_value = user
+        user = User(email="test@example.com", avatar="new_avatar_url")
+        mocked_result = MagicMock()
+        mocked_result.scalars.return_value.first.return_value = user
+        self.session.execute.return_value = mocked_result
         result = await update_avatar(email="test@example.com", url="new_avatar_url", db=self.session)
         self.assertEqual(result.avatar, "new_avatar_url")
-
+        self.session.execute.assert_awaited_once()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.avatar import upload_avatar
+
+
+class TestUploadAvatar(unittest.IsolatedAsyncioTestCase):
+    async def test_upload_avatar_updates_user_and_drops_cache(self):
+        session = MagicMock()
+        session_local = MagicMock()
+        session_local.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        mock_url = "https://res.cloudinary.com/demo/image/upload/v7/NotesApp/deadpool"
+        with patch("src.services.avatar.cloudinary.uploader.upload", return_value={"version": 7}) as mock_upload, \
+                patch("src.services.avatar.cloudinary.CloudinaryImage") as mock_image, \
+                patch("src.services.avatar.SessionLocal", session_local), \
+                patch("src.services.avatar.repository_users.update_avatar", AsyncMock()) as mock_update_avatar, \
+                patch("src.services.avatar.auth_service.drop_cached_user", AsyncMock()) as mock_drop_cached_user:
+            mock_image.return_value.build_url.return_value = mock_url
+            await upload_avatar(b"image-bytes", "deadpool", "deadpool@example.com")
+
+        mock_upload.assert_called_once_with(b"image-bytes", public_id="NotesApp/deadpool", overwrite=True)
+        mock_image.assert_called_once_with("NotesApp/deadpool")
+        mock_image.return_value.build_url.assert_called_once_with(width=250, height=250, crop="fill", version=7)
+        mock_update_avatar.assert_awaited_once_with("deadpool@example.com", mock_url, session)
+        mock_drop_cached_user.assert_awaited_once_with("deadpool@example.com")
+
+    async def test_upload_avatar_failure_is_reported(self):
+        error = Exception("Upload failed")
+        with patch("src.services.avatar.cloudinary.uploader.upload", side_effect=error), \
+                patch("src.services.avatar.repository_users.update_avatar", AsyncMock()) as mock_update_avatar, \
+                patch("src.services.avatar.auth_service.drop_cached_user", AsyncMock()) as mock_drop_cached_user, \
+                patch("builtins.print") as mock_print:
+            await upload_avatar(b"image-bytes", "deadpool", "deadpool@example.com")
+
+        mock_print.assert_called_once_with(error)
+        mock_update_avatar.assert_not_awaited()
+        mock_drop_cached_user.assert_not_awaited()
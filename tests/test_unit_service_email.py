@@ -0,0 +1,218 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import aiosmtplib
+from fastapi_mail import MessageSchema, MessageType
+from fastapi_mail.errors import ConnectionErrors
+
+from src.services import email as email_service
+from src.services.email import SMTPPool, conf
+
+
+class FakeSMTP:
+    """Stand-in for ``aiosmtplib.SMTP`` that records what is sent through each connection."""
+
+    instances = []
+    fail_connect = False
+    refused = set()
+    dropped = set()
+
+    def __init__(self, **kwargs):
+        self.is_connected = False
+        self.sent = []
+        self.quit_called = False
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        if FakeSMTP.fail_connect:
+            raise OSError("Connection refused")
+        self.is_connected = True
+
+    async def login(self, username, password):
+        pass
+
+    async def send_message(self, message):
+        recipient = message["To"]
+        if recipient in FakeSMTP.refused:
+            raise aiosmtplib.SMTPRecipientRefused(550, "Mailbox unavailable", recipient)
+        if recipient in FakeSMTP.dropped:
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+        self.sent.append(recipient)
+
+    async def quit(self):
+        self.quit_called = True
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+class SMTPTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        FakeSMTP.instances = []
+        FakeSMTP.fail_connect = False
+        FakeSMTP.refused = set()
+        FakeSMTP.dropped = set()
+        self.pool = SMTPPool(conf, size=1, max_messages=2)
+        patchers = [
+            patch("src.services.email.aiosmtplib.SMTP", FakeSMTP),
+            patch("src.services.email.smtp_pool", self.pool),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def sent(self):
+        return [recipient for smtp in FakeSMTP.instances for recipient in smtp.sent]
+
+
+class TestSMTPPool(SMTPTestCase):
+    async def test_release_reuses_connection(self):
+        smtp, sent = await self.pool.acquire()
+        await self.pool.release(smtp, sent + 1)
+        reused, reused_sent = await self.pool.acquire()
+        self.assertIs(reused, smtp)
+        self.assertEqual(reused_sent, 1)
+        self.assertEqual(len(FakeSMTP.instances), 1)
+
+    async def test_release_replaces_connection_after_max_messages(self):
+        smtp, _ = await self.pool.acquire()
+        await self.pool.release(smtp, 2)
+        self.assertTrue(smtp.quit_called)
+        replacement, sent = await self.pool.acquire()
+        self.assertIsNot(replacement, smtp)
+        self.assertEqual(sent, 0)
+
+    async def test_release_discards_broken_connection(self):
+        smtp, _ = await self.pool.acquire()
+        await self.pool.release(smtp, 1, broken=True)
+        self.assertTrue(smtp.quit_called)
+        self.assertEqual(self.pool.idle, [])
+
+    async def test_acquire_skips_disconnected_idle_connection(self):
+        smtp, _ = await self.pool.acquire()
+        await self.pool.release(smtp, 1)
+        smtp.is_connected = False
+        replacement, _ = await self.pool.acquire()
+        self.assertIsNot(replacement, smtp)
+
+    async def test_failed_connect_releases_semaphore(self):
+        FakeSMTP.fail_connect = True
+        with self.assertRaises(ConnectionErrors):
+            await self.pool.acquire()
+        FakeSMTP.fail_connect = False
+        smtp, _ = await asyncio.wait_for(self.pool.acquire(), timeout=1)
+        self.assertTrue(smtp.is_connected)
+
+    async def test_close_quits_idle_connections(self):
+        smtp, _ = await self.pool.acquire()
+        await self.pool.release(smtp, 1)
+        await self.pool.close()
+        self.assertTrue(smtp.quit_called)
+        self.assertEqual(self.pool.idle, [])
+
+    async def test_send_message_uses_pooled_connection(self):
+        for recipient in ("first@example.com", "second@example.com"):
+            message = MessageSchema(subject="Hi", recipients=[recipient], body="Hi", subtype=MessageType.plain)
+            await email_service.fm.send_message(message)
+        self.assertEqual(len(FakeSMTP.instances), 1)
+        self.assertEqual(self.sent(), ["first@example.com", "second@example.com"])
+        self.assertTrue(FakeSMTP.instances[0].quit_called)
+
+
+def recipients(count):
+    return [(f"user{i}@example.com", f"user{i}", "http://testserver/") for i in range(count)]
+
+
+class TestSendEmailsBulk(SMTPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool.max_messages = 100
+
+    async def test_sends_batch_through_one_connection(self):
+        failed = await email_service.send_emails_bulk(recipients(3))
+        self.assertEqual(failed, [])
+        self.assertEqual(len(FakeSMTP.instances), 1)
+        self.assertEqual(self.sent(), [email for email, _, _ in recipients(3)])
+
+    async def test_invalid_address_does_not_drop_batch(self):
+        emails = [recipients(1)[0], ("not-an-email", "bad", "http://testserver/"), recipients(2)[1]]
+        failed = await email_service.send_emails_bulk(emails)
+        self.assertEqual(failed, ["not-an-email"])
+        self.assertEqual(self.sent(), ["user0@example.com", "user1@example.com"])
+
+    async def test_refused_recipient_is_returned(self):
+        FakeSMTP.refused = {"user1@example.com"}
+        failed = await email_service.send_emails_bulk(recipients(3))
+        self.assertEqual(failed, ["user1@example.com"])
+        self.assertEqual(self.sent(), ["user0@example.com", "user2@example.com"])
+
+    async def test_aborts_large_batch_after_a_third_fails(self):
+        emails = recipients(30)
+        FakeSMTP.refused = {email for email, _, _ in emails}
+        with patch.object(FakeSMTP, "send_message", autospec=True, side_effect=FakeSMTP.send_message) as send:
+            failed = await email_service.send_emails_bulk(emails)
+        self.assertEqual(failed, [email for email, _, _ in emails])
+        self.assertEqual(send.call_count, 11)
+
+    async def test_small_batch_is_never_aborted(self):
+        emails = recipients(29)
+        FakeSMTP.refused = {email for email, _, _ in emails[:20]}
+        failed = await email_service.send_emails_bulk(emails)
+        self.assertEqual(len(failed), 20)
+        self.assertEqual(self.sent(), [email for email, _, _ in emails[20:]])
+
+    async def test_reconnects_after_dropped_session(self):
+        FakeSMTP.dropped = {"user1@example.com"}
+        failed = await email_service.send_emails_bulk(recipients(4))
+        self.assertEqual(failed, ["user1@example.com"])
+        self.assertEqual(len(FakeSMTP.instances), 2)
+        self.assertEqual(FakeSMTP.instances[1].sent, ["user2@example.com", "user3@example.com"])
+
+    async def test_returns_all_addresses_when_server_unreachable(self):
+        FakeSMTP.fail_connect = True
+        failed = await email_service.send_emails_bulk(recipients(3))
+        self.assertEqual(failed, [email for email, _, _ in recipients(3)])
+
+
+class TestEmailWorker(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.worker = email_service.EmailWorker(batch_size=32, batch_wait=0.01)
+        patcher = patch("src.services.email.send_emails_bulk", AsyncMock(return_value=[]))
+        self.send_emails_bulk = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_queued_emails_are_sent_as_one_batch(self):
+        self.worker.start()
+        await self.worker.put(recipients(5))
+        await asyncio.wait_for(self.worker.queue.join(), timeout=1)
+        self.send_emails_bulk.assert_awaited_once_with(recipients(5))
+        await self.worker.stop()
+
+    async def test_stop_drains_queue(self):
+        self.worker.start()
+        await self.worker.put(recipients(40))
+        await self.worker.stop(timeout=1)
+        self.assertTrue(self.worker.queue.empty())
+        self.assertFalse(self.worker.running)
+        batches = [call.args[0] for call in self.send_emails_bulk.await_args_list]
+        self.assertEqual([len(batch) for batch in batches], [32, 8])
+        self.assertEqual([item for batch in batches for item in batch], recipients(40))
+
+    async def test_failed_batch_does_not_stop_worker(self):
+        self.send_emails_bulk.side_effect = [RuntimeError("boom"), []]
+        self.worker.start()
+        with patch("builtins.print") as mock_print:
+            await self.worker.put(recipients(2))
+            await asyncio.wait_for(self.worker.queue.join(), timeout=1)
+        mock_print.assert_any_call("Confirmation emails not sent to: user0@example.com, user1@example.com")
+        await self.worker.put(recipients(1))
+        await self.worker.stop(timeout=1)
+        self.assertEqual(self.send_emails_bulk.await_count, 2)
+
+    async def test_put_sends_directly_when_worker_not_running(self):
+        await self.worker.put(recipients(2))
+        self.send_emails_bulk.assert_awaited_once_with(recipients(2))
+        self.assertTrue(self.worker.queue.empty())